@@ -0,0 +1,1302 @@
+import gc
+import sys
+import csv
+import json
+import math
+import time
+import random
+import platform
+import argparse
+import itertools
+import tracemalloc
+import multiprocessing
+from statistics import median, quantiles
+
+try:
+    import resource
+except ImportError:                 # Not available on Windows: no RSS figures there.
+    resource = None
+
+from protein_parsing_approaches import ProteinSolver, MarkerIndex, Trie
+
+# -----------------------------------------------------------------------------
+# Engines
+# -----------------------------------------------------------------------------
+
+# Benchmarked engines: (name, ProteinSolver method, largest N it is run for).
+# None means no limit. Brute Force is exponential, so it only gets tiny strands.
+ENGINES = [
+    ("Brute", "max_division_brute_force", 25),
+    ("B&B", "max_division_branch_and_bound", None),
+    ("Top-Down", "max_division_top_down_dp", None),
+    ("Bottom-Up", "max_division_bottom_up_dp", None),
+    ("Rolling", "max_division_rolling_hash", None),
+    ("Trie-DP", "max_division_trie_dp", None),
+    ("Ring", "max_division_ring_buffer_dp", None),
+    ("Aho-Cor", "max_division_aho_corasick", None),
+    ("Greedy", "max_division_greedy", None),
+    ("Parallel", "max_division_parallel", None),
+]
+
+# Engines run when none are named. Parallel is left out: on small inputs it measures
+# process pool start-up rather than the algorithm.
+DEFAULT_ENGINES = [name for name, _, _ in ENGINES if name != "Parallel"]
+
+# Sequence lengths of the default run (the N axis of the README table).
+DEFAULT_N_VALUES = [20, 50, 100, 500, 1000, 2000, 5000, 10000, 20000, 50000]
+
+# Version of the JSON result layout written by write_results.
+RESULTS_VERSION = 1
+
+def engine_method(name):
+    """
+    Returns (method name, largest N) of a benchmarked engine.
+    """
+    for engine, method, max_n in ENGINES:
+        if engine == name:
+            return method, max_n
+    raise ValueError(f"Unknown engine: {name!r} (choose from "
+                     f"{', '.join(engine for engine, _, _ in ENGINES)})")
+
+# -----------------------------------------------------------------------------
+# Workloads
+# -----------------------------------------------------------------------------
+
+# Parameters that define a benchmark case, in report order, with their defaults.
+# A sweep varies some of them; the others keep these values.
+CASE_DEFAULTS = {
+    "n": 1000,                 # Strand length N
+    "k": 50,                   # Maximum marker length
+    "num_markers": 1000,       # Marker set size |P|
+    "length_dist": "uniform",  # Marker length distribution (see draw_length)
+    "alphabet_size": 4,        # Letters used by strand and markers (ALPHABET prefix)
+    "workload": "random",      # Input generator (see WORKLOADS)
+    "density": 0.5,            # "realistic": fraction of the strand covered by markers
+    "prefix_share": 0.0,       # "realistic": fraction of markers extending another's prefix
+}
+CASE_KEYS = tuple(CASE_DEFAULTS)
+
+# Column titles of the case parameters in printed tables.
+CASE_TITLES = {"n": "N", "k": "k", "num_markers": "|P|", "length_dist": "lengths",
+               "alphabet_size": "alpha", "workload": "workload", "density": "density",
+               "prefix_share": "prefix"}
+
+# Letters for alphabet sizes beyond DNA: the remaining amino-acid codes.
+ALPHABET = "ACGTDEFHIKLMNPQRSVWY"
+
+# Marker length distributions over 1..k.
+LENGTH_DISTRIBUTIONS = ("uniform", "short", "long", "fixed")
+
+# Input generators. "random": independent random strand and markers, so few markers
+# occur and Trie walks end after a base or two. "realistic": markers are substrings
+# of the strand and are planted back into it (see generate_realistic). The rest is
+# the adversarial corpus (see ADVERSARIAL).
+WORKLOADS = ("random", "realistic")
+
+def draw_length(dist, k, rng):
+    """
+    Draws a marker length in 1..k: "uniform"; "short", exponential with mean about
+    k/4; "long", the mirror image of "short" (most markers close to k); "fixed", k.
+    """
+    if dist == "uniform":
+        return rng.randint(1, k)
+    if dist == "fixed":
+        return k
+    short = min(k, 1 + int(rng.expovariate(4 / k)))
+    if dist == "short":
+        return short
+    if dist == "long":
+        return k + 1 - short
+    raise ValueError(f"Unknown length distribution: {dist!r} "
+                     f"(choose from {', '.join(LENGTH_DISTRIBUTIONS)})")
+
+def generate_case_markers(num_markers, k, length_dist, alphabet, rng):
+    """
+    Generates 'num_markers' distinct random markers over 'alphabet' with lengths drawn
+    from 'length_dist'. Raises ValueError if that many distinct markers can't exist.
+    """
+    a = len(alphabet)
+    lengths = [k] if length_dist == "fixed" else range(1, k + 1)
+    if num_markers > sum(a ** length for length in lengths):
+        raise ValueError(f"Only {sum(a ** length for length in lengths)} distinct markers "
+                         f"exist for k={k}, alphabet size {a}, {length_dist} lengths")
+    markers = set()
+    while len(markers) < num_markers:
+        length = draw_length(length_dist, k, rng)
+        markers.add("".join(rng.choice(alphabet) for _ in range(length)))
+    return markers
+
+def generate_realistic(case, alphabet, rng):
+    """
+    Realistic workload: markers are cut out of a random background strand, a
+    'prefix_share' fraction of them instead extend a prefix of an earlier marker (as
+    related probes of one panel do), and markers are then planted, between gaps of
+    fresh random sequence, until the copies cover about a 'density' fraction of the
+    strand. Density 0 keeps the plain background, where each cut-out marker no longer
+    than N still occurs. Trie walks therefore run deep, as they do on real panels.
+    Returns (strand, markers).
+    """
+    n = case["n"]
+    k = case["k"]
+    num_markers = case["num_markers"]
+    density = case["density"]
+    if not 0 <= density <= 1 or not 0 <= case["prefix_share"] <= 1:
+        raise ValueError("density and prefix_share must be in [0, 1]")
+
+    background = "".join(rng.choice(alphabet) for _ in range(max(n, 4 * k)))
+    markers = []
+    seen = set()
+    # Duplicates are redrawn; give up when the parameters leave too few distinct markers.
+    attempts = 0
+    while len(markers) < num_markers:
+        attempts += 1
+        if attempts > 100 * num_markers + 1000:
+            raise ValueError(f"Could not draw {num_markers} distinct markers for k={k}, "
+                             f"alphabet size {len(alphabet)}")
+        length = draw_length(case["length_dist"], k, rng)
+        if markers and rng.random() < case["prefix_share"]:
+            parent = rng.choice(markers)
+            shared = parent[: rng.randint(1, len(parent))]
+            marker = shared[:length] + "".join(
+                rng.choice(alphabet) for _ in range(length - len(shared)))
+        else:
+            # Cut from the first N bases (the strand at density 0) when the marker fits.
+            start = rng.randrange(max(n, length) - length + 1)
+            marker = background[start : start + length]
+        if marker not in seen:
+            seen.add(marker)
+            markers.append(marker)
+
+    # Alternate random gaps and planted markers. With mean marker length L, gaps of
+    # mean L * (1 - density) / density make markers cover 'density' of the strand.
+    # The gaps are fresh sequence: cut from the background, they would carry marker
+    # occurrences of their own and overshoot the density.
+    if density == 0:
+        return background[:n], seen
+    mean_length = sum(map(len, markers)) / len(markers)
+    mean_gap = mean_length * (1 - density) / density
+    pieces = []
+    pos = 0
+    while pos < n:
+        gap = int(rng.expovariate(1 / mean_gap)) if mean_gap > 0 else 0
+        marker = rng.choice(markers)
+        pieces.append("".join(rng.choices(alphabet, k=gap)))
+        pieces.append(marker)
+        pos += gap + len(marker)
+    return "".join(pieces)[:n], seen
+
+def homopolymer(n, k, rng):
+    # A^n with markers A, AA, ..., A^k: a marker of every length starts (and ends) at
+    # every position, so every engine does its full k steps and k updates per base.
+    return "A" * n, {"A" * length for length in range(1, k + 1)}
+
+def near_miss(n, k, rng):
+    # A^n with markers A^(i-1) followed by C, G or T: every Trie walk runs to depth
+    # k-1 and fails on the last base, every slice is hashed and missed, and the
+    # score is 0.
+    return "A" * n, {"A" * (length - 1) + c for length in range(1, k + 1) for c in "CGT"}
+
+def shared_prefix(n, k, rng):
+    # A random word w of length k-1, repeated; markers branch off every prefix of w
+    # with a wrong base, and extend all of w with a base other than w[0]. Walks from
+    # positions in phase with w run the full k-1 bases before missing; unlike
+    # near_miss, the strand does not look periodic to short windows.
+    w = "".join(rng.choice("ACGT") for _ in range(max(k - 1, 1)))
+    markers = {w[:i] + c for i in range(len(w)) for c in "ACGT" if c != w[i]}
+    markers |= {w + c for c in "ACGT" if c != w[0]}
+    return (w * (n // len(w) + 1))[:n], {p for p in markers if len(p) <= k}
+
+def periodic(n, k, rng):
+    # (AC)^(n/2) with every substring of (AC)^infinity of length 2..k: overlapping
+    # matches of all lengths at every position, and long failure-link chains.
+    unit = "AC" * k
+    return (unit * (n // len(unit) + 1))[:n], {unit[s : s + length] for s in (0, 1)
+                                                for length in range(2, k + 1)}
+
+def dense_kmers(n, k, rng):
+    # A random strand against every DNA string of length 1..min(k, 6) (5460 markers):
+    # the Trie is complete, so no walk ends before min(k, 6) bases.
+    depth = min(k, 6)
+    markers = {""}
+    level = [""]
+    for _ in range(depth):
+        level = [p + c for p in level for c in "ACGT"]
+        markers.update(level)
+    markers.discard("")
+    return "".join(rng.choice("ACGT") for _ in range(n)), markers
+
+# Adversarial corpus: workload name -> (generator(n, k, rng), engine limits). Each case
+# drives the engines to their worst case for its N and k (num_markers, length_dist and
+# alphabet_size are ignored). The limits cap N per engine beyond ENGINES: Brute Force
+# enumerates every split whatever the markers, so it stays tiny.
+ADVERSARIAL = {
+    "homopolymer": (homopolymer, {"Brute": 16}),
+    "near_miss": (near_miss, {"Brute": 16}),
+    "shared_prefix": (shared_prefix, {"Brute": 16}),
+    "periodic": (periodic, {"Brute": 16}),
+    "dense_kmers": (dense_kmers, {"Brute": 16}),
+}
+WORKLOADS += tuple(ADVERSARIAL)
+
+def corpus_plan(n_values, k_values):
+    """
+    Plan running the whole adversarial corpus for every N and k.
+    """
+    return grid_plan({"workload": list(ADVERSARIAL), "n": list(n_values), "k": list(k_values)})
+
+def engine_limit(case, name):
+    """
+    Largest N an engine is run for on a case: the smaller of its ENGINES limit and
+    the case's adversarial limit (None: no limit).
+    """
+    _, max_n = engine_method(name)
+    if case["workload"] in ADVERSARIAL:
+        limit = ADVERSARIAL[case["workload"]][1].get(name)
+        if limit is not None:
+            max_n = limit if max_n is None else min(max_n, limit)
+    return max_n
+
+def full_case(case):
+    """
+    Completes a (partial) case with CASE_DEFAULTS, in CASE_KEYS order.
+    """
+    unknown = set(case) - set(CASE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown case parameters: {', '.join(sorted(unknown))}")
+    return {key: case.get(key, default) for key, default in CASE_DEFAULTS.items()}
+
+def case_key(case):
+    # Hashable identity of a case (a case dict or a record).
+    return tuple(case[key] for key in CASE_KEYS)
+
+def case_seed(seed, case):
+    """
+    Derives the seed of one benchmark case from the run seed and its parameters, so a
+    case gets the same inputs whatever else the run contains.
+    """
+    return random.Random(f"{seed}:{case_key(case)}").getrandbits(32)
+
+def make_case(case, seed):
+    """
+    Generates the seeded strand and marker set of one (complete) benchmark case.
+    """
+    if not 1 <= case["alphabet_size"] <= len(ALPHABET):
+        raise ValueError(f"alphabet_size must be in 1..{len(ALPHABET)}")
+    rng = random.Random(case_seed(seed, case))
+    alphabet = ALPHABET[: case["alphabet_size"]]
+    if case["workload"] == "realistic":
+        return generate_realistic(case, alphabet, rng)
+    if case["workload"] in ADVERSARIAL:
+        return ADVERSARIAL[case["workload"]][0](case["n"], case["k"], rng)
+    if case["workload"] != "random":
+        raise ValueError(f"Unknown workload: {case['workload']!r} "
+                         f"(choose from {', '.join(WORKLOADS)})")
+    strand = "".join(rng.choice(alphabet) for _ in range(case["n"]))
+    markers = generate_case_markers(case["num_markers"], case["k"], case["length_dist"],
+                                    alphabet, rng)
+    return strand, markers
+
+# -----------------------------------------------------------------------------
+# Sweep Plans
+# -----------------------------------------------------------------------------
+
+def grid_plan(axes):
+    """
+    Full factorial plan: one case per combination of the axis levels.
+    'axes' maps case parameters to lists of levels.
+    """
+    names = list(axes)
+    return [full_case(dict(zip(names, levels)))
+            for levels in itertools.product(*(axes[name] for name in names))]
+
+def lhs_plan(axes, samples, seed=0):
+    """
+    Latin hypercube plan of 'samples' cases: every axis is cut into 'samples' equal
+    strata and each stratum is used exactly once, so a few cases still cover every
+    axis evenly. An axis is either a list of levels (the stratum picks one) or a
+    (low, high) pair: integers are sampled log-uniformly (lengths and sizes span
+    orders of magnitude), floats uniformly.
+    """
+    rng = random.Random(seed)
+    columns = {}
+    for name, axis in axes.items():
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        values = []
+        for stratum in strata:
+            u = (stratum + rng.random()) / samples
+            if isinstance(axis, tuple) and isinstance(axis[0], float):
+                low, high = axis
+                values.append(low + u * (high - low))
+            elif isinstance(axis, tuple):
+                low, high = axis
+                values.append(round(math.exp(math.log(low) + u * (math.log(high) - math.log(low)))))
+            else:
+                values.append(axis[min(int(u * len(axis)), len(axis) - 1)])
+        columns[name] = values
+    return [full_case({name: columns[name][i] for name in axes}) for i in range(samples)]
+
+# -----------------------------------------------------------------------------
+# Measurement
+# -----------------------------------------------------------------------------
+
+def measure(fn, warmup=2, repeats=7, isolate_gc=True):
+    """
+    Calls fn() 'warmup' times untimed, then 'repeats' times timed with perf_counter_ns.
+    With 'isolate_gc', garbage is collected before every trial and the collector is
+    paused during it, so no trial pays for another's garbage.
+    Returns the per-trial times in nanoseconds and the result of the last call.
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            if isolate_gc:
+                gc.collect()
+                gc.disable()
+            start = time.perf_counter_ns()
+            result = fn()
+            samples.append(time.perf_counter_ns() - start)
+            if isolate_gc and gc_was_enabled:
+                gc.enable()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples, result
+
+def summarize(samples):
+    """
+    Robust summary of a list of timings: median, quartiles, IQR and minimum.
+    """
+    if len(samples) > 1:
+        q1, _, q3 = quantiles(samples, n=4, method="inclusive")
+    else:
+        q1 = q3 = samples[0]
+    return {
+        "median_ns": median(samples),
+        "q1_ns": q1,
+        "q3_ns": q3,
+        "iqr_ns": q3 - q1,
+        "min_ns": min(samples),
+    }
+
+def bench_case(case, seed, engines, warmup=2, repeats=7, isolate_gc=True):
+    """
+    Times every engine on one seeded case. Returns one record per engine (skipped
+    engines included, with "skipped": True) holding the case parameters, the raw
+    samples and their summary. An engine that runs out of stack or memory is
+    recorded as skipped, with the exception name as "error".
+    """
+    case = full_case(case)
+    strand, markers = make_case(case, seed)
+    solver = ProteinSolver(strand, markers, case["k"])
+    # Benchmarks must compute every time, whatever the module default is.
+    solver.result_cache = None
+
+    records = []
+    for name in engines:
+        method, _ = engine_method(name)
+        max_n = engine_limit(case, name)
+        record = dict(case, engine=name, method=method, seed=seed, warmup=warmup,
+                      repeats=repeats)
+        if max_n is not None and case["n"] > max_n:
+            record["skipped"] = True
+            records.append(record)
+            continue
+        try:
+            samples, result = measure(getattr(solver, method), warmup, repeats, isolate_gc)
+        except (RecursionError, MemoryError) as e:
+            # E.g. Branch and Bound recurses once per base of a segment without cut
+            # points, which the adversarial strands are made of.
+            record.update(skipped=True, error=type(e).__name__)
+        else:
+            record.update(skipped=False, result=result, samples_ns=samples,
+                          **summarize(samples))
+        records.append(record)
+    return records
+
+# -----------------------------------------------------------------------------
+# Results
+# -----------------------------------------------------------------------------
+
+# Columns of the tidy table: one row per (case, engine) cell.
+TIDY_COLUMNS = CASE_KEYS + ("engine", "skipped", "error", "result", "median_ns", "q1_ns",
+                            "q3_ns", "iqr_ns", "min_ns", "repeats", "seed")
+
+def environment():
+    """
+    Describes the machine and interpreter, stored with every result file.
+    """
+    clock = time.get_clock_info("perf_counter")
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timer": "perf_counter_ns",
+        "timer_resolution_s": clock.resolution,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+def write_results(path, config, records, **sections):
+    """
+    Writes a run as JSON: layout version, environment, run configuration, records and
+    any extra 'sections' (e.g. fits) that are not None.
+    """
+    data = {"version": RESULTS_VERSION, "environment": environment(),
+            "config": config, "records": records}
+    data.update((name, value) for name, value in sections.items() if value is not None)
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+def read_results(path):
+    """
+    Reads a result file written by write_results.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark result version {data.get('version')!r}")
+    return data
+
+def write_tidy(path, records, columns=TIDY_COLUMNS):
+    """
+    Writes the records as a tidy CSV table ('columns', one row per case and engine),
+    ready for a dataframe or a spreadsheet pivot.
+    """
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(records)
+
+def check_agreement(records):
+    """
+    Returns the cases (as case_key tuples) on which the engines disagree on the score.
+    A benchmark of a wrong answer is meaningless, so the runner reports these.
+    """
+    results = {}
+    for r in records:
+        if not r["skipped"]:
+            results.setdefault(case_key(r), set()).add(r["result"])
+    return [case for case, values in results.items() if len(values) > 1]
+
+def fastest_engines(records):
+    """
+    Returns {case_key: engine with the lowest median} over the engines that ran.
+    """
+    best = {}
+    for r in records:
+        if not r["skipped"]:
+            key = case_key(r)
+            if key not in best or r["median_ns"] < best[key]["median_ns"]:
+                best[key] = r
+    return {key: r["engine"] for key, r in best.items()}
+
+def format_time(ns):
+    # Milliseconds with enough digits for the fastest engines.
+    return f"{ns / 1e6:.3f}"
+
+def print_grid(title, records, columns, cell, summary=None):
+    """
+    Prints one row per case and one column per name in 'columns' (matched against the
+    records' "engine"), each cell formatted by cell(record). 'summary' optionally adds
+    a last column: (title, {case_key: text}). Only the case parameters that vary get
+    a column.
+    """
+    cells = {}
+    cases = []
+    for r in records:
+        case = case_key(r)
+        if case not in cases:
+            cases.append(case)
+        cells[case, r["engine"]] = cell(r)
+
+    shown = [i for i, key in enumerate(CASE_KEYS)
+             if key == "n" or len({case[i] for case in cases}) > 1]
+    widths = {i: max([len(CASE_TITLES[CASE_KEYS[i]])] + [len(str(case[i])) for case in cases])
+              for i in shown}
+    width = max([17] + [len(c) for c in cells.values()])
+    extra = [summary[0]] if summary else []
+    header = " | ".join([f"{CASE_TITLES[CASE_KEYS[i]]:<{widths[i]}}" for i in shown] +
+                        [f"{e:<{width}}" for e in columns] + extra)
+    print(title)
+    print(header)
+    print("-" * len(header))
+    for case in cases:
+        row = ([f"{case[i]!s:<{widths[i]}}" for i in shown] +
+               [f"{cells.get((case, e), ''):<{width}}" for e in columns])
+        if summary:
+            row.append(summary[1].get(case, ""))
+        print(" | ".join(row))
+
+def time_cell(r):
+    # Skipped cells show "Skipped", or the error that stopped the engine.
+    if r["skipped"]:
+        return r.get("error", "Skipped")
+    return f"{format_time(r['median_ns'])}±{format_time(r['iqr_ns'])}"
+
+def print_table(records, engines):
+    """
+    Prints the median time in milliseconds of every engine for every case, with the IQR
+    as a +- spread, and the fastest engine.
+    """
+    print_grid("Median time in ms ± IQR", records, engines, time_cell,
+               ("Fastest", fastest_engines(records)))
+
+# -----------------------------------------------------------------------------
+# Memory
+# -----------------------------------------------------------------------------
+
+# Index structures whose construction is measured on its own ("build" phase):
+# the compiled MarkerIndex (flat Trie) the solvers use, and the TrieNode graph of
+# the original pointer-based Trie, for comparison.
+BUILDS = [
+    ("MarkerIndex", MarkerIndex),
+    ("TrieNode", lambda markers: _build_node_trie(markers)),
+]
+
+# Columns of the tidy memory table.
+MEMORY_COLUMNS = CASE_KEYS + ("engine", "phase", "skipped", "error", "peak_bytes",
+                              "retained_bytes", "peak_rss_bytes", "rss_increase_bytes",
+                              "seed")
+
+def _build_node_trie(markers):
+    trie = Trie()
+    for p in markers:
+        trie.insert(p)
+    return trie
+
+def traced(fn):
+    """
+    Runs fn() under tracemalloc. Returns its result, the peak of the memory it
+    allocated and the part of it still allocated on return (e.g. self.memo,
+    self.scores or the Trie-DP table, which the solver keeps), both in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        base, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak - base, current - base
+
+def max_rss():
+    """
+    Peak resident set size of this process so far, in bytes (None if unknown).
+    """
+    # On Linux, prefer VmHWM: ru_maxrss survives exec, so a spawned child would
+    # report its parent's peak.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return rss if sys.platform == "darwin" else rss * 1024
+
+def _rss_cell(task):
+    """
+    Runs one build or solve in a fresh process and returns (peak RSS, increase of the
+    peak RSS during the measured step). The peak only ever grows, so each cell needs
+    its own process.
+    """
+    case, seed, phase, name = task
+    strand, markers = make_case(case, seed)
+    if phase == "build":
+        before = max_rss()
+        structure = dict(BUILDS)[name](markers)
+    else:
+        solver = ProteinSolver(strand, markers, case["k"], index=MarkerIndex(markers))
+        solver.result_cache = None
+        method, _ = engine_method(name)
+        before = max_rss()
+        getattr(solver, method)()
+    after = max_rss()
+    return after, after - before
+
+def memory_case(case, seed, engines, rss=True):
+    """
+    Measures one seeded case: the build of every BUILDS structure, then every engine's
+    solve on its own freshly built index. Each record holds the traced peak and retained
+    bytes and, with 'rss' (where the peak RSS can be read), the peak RSS of a separate
+    process doing the same step.
+    """
+    case = full_case(case)
+    strand, markers = make_case(case, seed)
+    tasks = []
+    records = []
+    for name, build in BUILDS:
+        _, peak, retained = traced(lambda: build(markers))
+        records.append(dict(case, engine=name, phase="build", skipped=False, seed=seed,
+                            peak_bytes=peak, retained_bytes=retained))
+        tasks.append((case, seed, "build", name))
+
+    for name in engines:
+        method, _ = engine_method(name)
+        record = dict(case, engine=name, phase="solve", seed=seed)
+        max_n = engine_limit(case, name)
+        if max_n is not None and case["n"] > max_n:
+            record["skipped"] = True
+            records.append(record)
+            continue
+        # A fresh solver and index per engine, so no engine's tables are charged to
+        # another: the automaton an engine builds lazily is charged to every engine
+        # that needs it, as in _rss_cell. The index itself is built untraced.
+        solver = ProteinSolver(strand, markers, case["k"], index=MarkerIndex(markers))
+        solver.result_cache = None
+        try:
+            _, peak, retained = traced(getattr(solver, method))
+        except (RecursionError, MemoryError) as e:
+            record.update(skipped=True, error=type(e).__name__)
+        else:
+            record.update(skipped=False, peak_bytes=peak, retained_bytes=retained)
+            tasks.append((case, seed, "solve", name))
+        records.append(record)
+
+    if rss and max_rss() is not None:
+        # Spawned, not forked: a forked child would inherit this process's peak.
+        # One task per worker, so every cell starts from a fresh peak (a Pool, as
+        # ProcessPoolExecutor only takes max_tasks_per_child from Python 3.11 on).
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            measured = dict(zip(((t[2], t[3]) for t in tasks),
+                                pool.map(_rss_cell, tasks, chunksize=1)))
+        for r in records:
+            if (r["phase"], r["engine"]) in measured:
+                r["peak_rss_bytes"], r["rss_increase_bytes"] = measured[r["phase"], r["engine"]]
+    return records
+
+def format_bytes(size):
+    # Mebibytes, with enough digits for tiny tables.
+    return f"{size / 2**20:.3f}"
+
+def memory_cell(r):
+    if r["skipped"]:
+        return r.get("error", "Skipped")
+    text = f"{format_bytes(r['peak_bytes'])}/{format_bytes(r['retained_bytes'])}"
+    if "rss_increase_bytes" in r:
+        text += f" +{format_bytes(r['rss_increase_bytes'])}"
+    return text
+
+def print_memory_table(records, engines):
+    """
+    Prints the traced peak / retained MiB of every build and engine for every case,
+    followed by the growth of the peak RSS ("+") when it was measured.
+    """
+    print_grid("Memory in MiB: traced peak / retained (+ peak RSS growth)", records,
+               [name for name, _ in BUILDS] + list(engines), memory_cell)
+
+# -----------------------------------------------------------------------------
+# Phases
+# -----------------------------------------------------------------------------
+
+# What each engine builds from the markers before it can solve: "trie" (the compiled
+# MarkerIndex), "automaton" (the index plus its Aho-Corasick automaton) or
+# "fingerprints" (per-length marker hashes). Engines not listed only use the set.
+ENGINE_NEEDS = {
+    "Trie-DP": "trie",
+    "Ring": "trie",
+    "Aho-Cor": "automaton",
+    "Greedy": "automaton",
+    "Parallel": "automaton",
+    "Rolling": "fingerprints",
+}
+
+# Batch sizes (strands scored per build) of the amortised cost report.
+BATCH_SIZES = (1, 100, 10**6)
+
+def timed_build(name, strand, markers, k, index):
+    """
+    Builds a solver for engine 'name' and times only the preprocessing that engine
+    needs (see ENGINE_NEEDS). 'index' is a prebuilt MarkerIndex that engines without
+    a Trie are given for free. Returns (solver, nanoseconds, the built structure).
+    """
+    need = ENGINE_NEEDS.get(name)
+    if need in ("trie", "automaton"):
+        start = time.perf_counter_ns()
+        own = MarkerIndex(markers)
+        if need == "automaton":
+            own.get_automaton()
+        elapsed = time.perf_counter_ns() - start
+        solver = ProteinSolver(strand, markers, k, index=own)
+        built = own
+    elif need == "fingerprints":
+        solver = ProteinSolver(strand, markers, k, index=index)
+        start = time.perf_counter_ns()
+        solver.fingerprints = built = solver._build_fingerprints()
+        elapsed = time.perf_counter_ns() - start
+    else:
+        start = time.perf_counter_ns()
+        built = set(markers)
+        elapsed = time.perf_counter_ns() - start
+        solver = ProteinSolver(strand, built, k, index=index)
+    solver.result_cache = None
+    return solver, elapsed, built
+
+def timed_teardown(holder):
+    """
+    Times releasing the object in holder[0] (the only reference to it) and collecting
+    what it leaves for the cycle collector. A collection scans the whole heap, so the
+    time of one with nothing to free is subtracted. Returns nanoseconds.
+    """
+    gc.collect()
+    start = time.perf_counter_ns()
+    gc.collect()
+    baseline = time.perf_counter_ns() - start
+    start = time.perf_counter_ns()
+    holder.clear()
+    gc.collect()
+    return max(0, time.perf_counter_ns() - start - baseline)
+
+def amortized(build_ns, solve_ns, strand_teardown_ns, index_teardown_ns, batch):
+    # Cost per strand when one build serves 'batch' strands: every strand is solved
+    # and torn down, the built structures are built and torn down once.
+    return (build_ns + index_teardown_ns) / batch + solve_ns + strand_teardown_ns
+
+def phase_case(case, seed, engines, warmup=2, repeats=7, batch_sizes=BATCH_SIZES):
+    """
+    Times the three phases of every engine on one seeded case:
+    - build: the engine's preprocessing (timed_build), once per repeat
+    - solve: one strand on the built solver, as in bench_case
+    - teardown (timed_teardown), in two parts: releasing a solved solver with the
+      per-strand tables it holds (memo, scores, the Trie-DP table), once per strand;
+      then releasing the built structure, once per build
+    Medians of each phase give the amortised per-strand cost for every batch size.
+    """
+    case = full_case(case)
+    strand, markers = make_case(case, seed)
+    index = MarkerIndex(markers)
+    records = []
+    for name in engines:
+        method, _ = engine_method(name)
+        record = dict(case, engine=name, method=method, seed=seed, warmup=warmup,
+                      repeats=repeats)
+        max_n = engine_limit(case, name)
+        if max_n is not None and case["n"] > max_n:
+            record["skipped"] = True
+            records.append(record)
+            continue
+
+        solver, _, _ = timed_build(name, strand, markers, case["k"], index)
+        try:
+            solves, _ = measure(getattr(solver, method), warmup, repeats)
+        except (RecursionError, MemoryError) as e:
+            record.update(skipped=True, error=type(e).__name__)
+            records.append(record)
+            continue
+        solver = None
+
+        builds = []
+        strand_teardowns = []
+        index_teardowns = []
+        for _ in range(repeats):
+            gc.collect()
+            solver, elapsed, built = timed_build(name, strand, markers, case["k"], index)
+            builds.append(elapsed)
+            # Solve first, so the solver holds the tables a real strand leaves behind.
+            getattr(solver, method)()
+            # The built structure is still referenced by 'built', so only the
+            # per-strand state goes with the solver.
+            holder = [solver]
+            solver = None
+            strand_teardowns.append(timed_teardown(holder))
+            holder = [built]
+            built = None
+            index_teardowns.append(timed_teardown(holder))
+
+        build_ns, solve_ns = median(builds), median(solves)
+        strand_teardown_ns, index_teardown_ns = median(strand_teardowns), median(index_teardowns)
+        record.update(skipped=False, build_ns=build_ns, solve_ns=solve_ns,
+                      strand_teardown_ns=strand_teardown_ns,
+                      index_teardown_ns=index_teardown_ns, build_samples_ns=builds,
+                      solve_samples_ns=solves, strand_teardown_samples_ns=strand_teardowns,
+                      index_teardown_samples_ns=index_teardowns)
+        for batch in batch_sizes:
+            record[f"amortized_{batch}_ns"] = amortized(build_ns, solve_ns, strand_teardown_ns,
+                                                        index_teardown_ns, batch)
+        records.append(record)
+    return records
+
+def print_phase_table(records, batch_sizes=BATCH_SIZES):
+    """
+    Prints, for every case, the median build / solve / per-strand teardown / index
+    teardown time of each engine and its amortised cost per strand for every batch
+    size, all in milliseconds.
+    """
+    cases = []
+    for r in records:
+        if case_key(r) not in cases:
+            cases.append(case_key(r))
+    columns = (["build", "solve", "strand teardown", "index teardown"] +
+               [f"per strand @{b:,}" for b in batch_sizes])
+    width = max(12, max(len(c) for c in columns))
+    print("Median phase times and amortised cost per strand, in ms")
+    for case in cases:
+        print()
+        print(", ".join(f"{CASE_TITLES[key]}={value}" for key, value in zip(CASE_KEYS, case)))
+        header = f"{'Engine':<10} | " + " | ".join(f"{c:<{width}}" for c in columns)
+        print(header)
+        print("-" * len(header))
+        for r in records:
+            if case_key(r) != case:
+                continue
+            if r["skipped"]:
+                cells = [r.get("error", "Skipped")] + [""] * (len(columns) - 1)
+            else:
+                cells = [format_time(r["build_ns"]), format_time(r["solve_ns"]),
+                         format_time(r["strand_teardown_ns"]),
+                         format_time(r["index_teardown_ns"])]
+                cells += [format_time(r[f"amortized_{b}_ns"]) for b in batch_sizes]
+            print(f"{r['engine']:<10} | " + " | ".join(f"{c:<{width}}" for c in cells))
+
+# -----------------------------------------------------------------------------
+# Complexity Fitting
+# -----------------------------------------------------------------------------
+
+# Documented time complexity of every engine (see the README), as exponents of N and
+# k. None: no polynomial bound to check (the exhaustive searches). The O(N +
+# occurrences) engines are bounded by O(N * k), as up to k markers end per base.
+DOCUMENTED_EXPONENTS = {
+    "Brute": None,
+    "B&B": None,
+    "Top-Down": {"n": 1, "k": 2},
+    "Bottom-Up": {"n": 1, "k": 2},
+    "Rolling": {"n": 1, "k": 1},
+    "Trie-DP": {"n": 1, "k": 1},
+    "Ring": {"n": 1, "k": 1},
+    "Aho-Cor": {"n": 1, "k": 1},
+    "Greedy": {"n": 1, "k": 1},
+    "Parallel": {"n": 1, "k": 1},
+}
+
+# Axes along which exponents are fitted.
+FIT_AXES = ("n", "k")
+
+# A fitted exponent is flagged when even the low end of its confidence interval
+# exceeds the documented one by more than this.
+FIT_TOLERANCE = 0.15
+
+# Two-sided 95% quantiles of Student's t for 1..30 degrees of freedom; beyond that
+# the normal 1.96 is close enough.
+T_QUANTILES_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                  2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                  2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+def fit_slope(groups):
+    """
+    Least-squares slope shared by several groups of (x, y) points, each group with its
+    own intercept (x and y are centred per group). Returns (slope, 95% CI half-width
+    or None when there are too few points, number of points).
+    """
+    sxx = sxy = 0.0
+    centred = []
+    for points in groups:
+        mx = sum(x for x, _ in points) / len(points)
+        my = sum(y for _, y in points) / len(points)
+        for x, y in points:
+            centred.append((x - mx, y - my))
+            sxx += (x - mx) ** 2
+            sxy += (x - mx) * (y - my)
+    if sxx == 0:
+        return None, None, len(centred)
+    slope = sxy / sxx
+    df = len(centred) - len(groups) - 1
+    if df < 1:
+        return slope, None, len(centred)
+    residual = sum((y - slope * x) ** 2 for x, y in centred) / df
+    t = T_QUANTILES_95[df - 1] if df <= len(T_QUANTILES_95) else 1.96
+    return slope, t * math.sqrt(residual / sxx), len(centred)
+
+def fit_complexity(records, tolerance=FIT_TOLERANCE):
+    """
+    Fits, per engine and axis (N, k), the exponent of the median time on a log-log
+    scale. Cases that differ only along the axis form a group; all groups share one
+    slope. Returns one dict per fit with the exponent, its 95% confidence interval,
+    the documented exponent and "exceeds" (see FIT_TOLERANCE).
+    """
+    fits = []
+    engines = []
+    for r in records:
+        if r["engine"] not in engines:
+            engines.append(r["engine"])
+    for engine in engines:
+        documented = DOCUMENTED_EXPONENTS.get(engine)
+        for axis in FIT_AXES:
+            position = CASE_KEYS.index(axis)
+            groups = {}
+            for r in records:
+                if r["engine"] == engine and not r["skipped"] and r["median_ns"] > 0:
+                    rest = case_key(r)[:position] + case_key(r)[position + 1:]
+                    groups.setdefault(rest, []).append((math.log(r[axis]), math.log(r["median_ns"])))
+            # Only groups that actually vary along the axis say anything about it.
+            groups = [points for points in groups.values() if len({x for x, _ in points}) > 1]
+            if not groups:
+                continue
+            slope, half_width, points = fit_slope(groups)
+            if slope is None:
+                continue
+            expected = None if documented is None else documented[axis]
+            low = slope if half_width is None else slope - half_width
+            fits.append({
+                "engine": engine, "axis": axis, "exponent": slope,
+                "ci_low": None if half_width is None else slope - half_width,
+                "ci_high": None if half_width is None else slope + half_width,
+                "points": points, "groups": len(groups), "documented": expected,
+                "exceeds": expected is not None and low > expected + tolerance,
+            })
+    return fits
+
+def print_fits(fits):
+    """
+    Prints the fitted exponents with their confidence intervals next to the documented
+    ones, marking any that exceed them.
+    """
+    print("Empirical complexity: time ~ N^a and ~ k^b (log-log fit, 95% CI)")
+    header = f"{'Engine':<10} | {'Axis':<4} | {'Exponent':<8} | {'95% CI':<15} | {'Documented':<10} | {'Points':<6} | Flag"
+    print(header)
+    print("-" * len(header))
+    for f in fits:
+        ci = "" if f["ci_low"] is None else f"[{f['ci_low']:.2f}, {f['ci_high']:.2f}]"
+        documented = "-" if f["documented"] is None else str(f["documented"])
+        flag = "EXCEEDS" if f["exceeds"] else ""
+        print(f"{f['engine']:<10} | {CASE_TITLES[f['axis']]:<4} | {f['exponent']:<8.2f} | "
+              f"{ci:<15} | {documented:<10} | {f['points']:<6} | {flag}")
+
+# -----------------------------------------------------------------------------
+# Regression Gate
+# -----------------------------------------------------------------------------
+
+# A cell regresses when its median grows by more than this fraction of the
+# baseline median.
+REGRESSION_THRESHOLD = 0.10
+
+# Columns of the tidy comparison table.
+COMPARISON_COLUMNS = CASE_KEYS + ("engine", "status", "baseline_ns", "median_ns", "delta")
+
+def compare_results(baseline, records, threshold=REGRESSION_THRESHOLD):
+    """
+    Compares 'records' with the records of a 'baseline' run, cell by cell (case and
+    engine). Returns one dict per baseline cell with both medians, the relative
+    delta and a status: "ok", "faster", "slower", "wrong" (the score changed),
+    "failed" (skipped now, but not in the baseline) or "missing". Every status but
+    "ok" and "faster" fails the gate. A cell is only "slower" (or "faster") when its
+    median moved beyond 'threshold' and the two runs' IQRs do not overlap, so that
+    noise alone does not fail the gate.
+    """
+    current = {(case_key(r), r["engine"]): r for r in records}
+    comparison = []
+    for old in baseline:
+        row = {key: old[key] for key in CASE_KEYS}
+        row.update(engine=old["engine"], baseline_ns=old.get("median_ns"),
+                   median_ns=None, delta=None)
+        new = current.get((case_key(old), old["engine"]))
+        if old["skipped"]:
+            # Nothing to compare against; the cell can only improve.
+            row["status"] = "ok"
+        elif new is None:
+            row["status"] = "missing"
+        elif new["skipped"]:
+            row["status"] = "failed"
+        else:
+            row["median_ns"] = new["median_ns"]
+            row["delta"] = new["median_ns"] / old["median_ns"] - 1 if old["median_ns"] else 0.0
+            if new["result"] != old["result"]:
+                row["status"] = "wrong"
+            elif row["delta"] > threshold and new["q1_ns"] > old["q3_ns"]:
+                row["status"] = "slower"
+            elif row["delta"] < -threshold and new["q3_ns"] < old["q1_ns"]:
+                row["status"] = "faster"
+            else:
+                row["status"] = "ok"
+        comparison.append(row)
+    return comparison
+
+def regressions(comparison):
+    # The cells that fail the gate.
+    return [row for row in comparison if row["status"] not in ("ok", "faster")]
+
+def delta_cell(row):
+    # Relative change of the median; cells failing the gate are marked with "!".
+    if row["delta"] is None:
+        return row["status"] if row["status"] != "ok" else "-"
+    mark = "" if row["status"] in ("ok", "faster") else f" ! {row['status']}"
+    return f"{row['delta']:+.1%}{mark}"
+
+def print_comparison(comparison, engines, threshold=REGRESSION_THRESHOLD):
+    """
+    Prints the change of the median of every engine for every case relative to the
+    baseline, and how many cells fail the gate.
+    """
+    failed = regressions(comparison)
+    print_grid(f"Median time vs baseline (threshold {threshold:+.0%})",
+               comparison, engines, delta_cell)
+    print(f"{len(failed)} of {len(comparison)} cells regressed" if failed else
+          f"No regressions in {len(comparison)} cells")
+
+# -----------------------------------------------------------------------------
+# Runner
+# -----------------------------------------------------------------------------
+
+def run_suite(plan=None, seed=0, engines=DEFAULT_ENGINES, warmup=2, repeats=7,
+              isolate_gc=True, json_path=None, csv_path=None, verbose=True, fit=False):
+    """
+    Benchmarks 'engines' on every case of 'plan' (a list of case dicts, see grid_plan
+    and lhs_plan; default: the README's N axis), prints the table and optionally
+    writes the JSON results and the tidy CSV table. With 'fit', the empirical
+    exponents (fit_complexity) are printed and stored too. Returns the records.
+    """
+    if plan is None:
+        plan = grid_plan({"n": DEFAULT_N_VALUES})
+    plan = [full_case(case) for case in plan]
+    config = {"mode": "time", "plan": plan, "seed": seed, "engines": list(engines),
+              "warmup": warmup, "repeats": repeats, "isolate_gc": isolate_gc}
+    records = []
+    for case in plan:
+        try:
+            records.extend(bench_case(case, seed, engines, warmup, repeats, isolate_gc))
+        except ValueError as e:
+            # A sweep can combine levels no input satisfies (e.g. more markers than
+            # exist for a small k); such cases are left out of the results.
+            if verbose:
+                print(f"Skipping case {case_key(case)}: {e}")
+    fits = fit_complexity(records) if fit else None
+    if verbose:
+        print_table(records, engines)
+        for case in check_agreement(records):
+            print("WARNING: engines disagree on " +
+                  ", ".join(f"{CASE_TITLES[key]}={value}" for key, value in zip(CASE_KEYS, case)))
+        if fits:
+            print()
+            print_fits(fits)
+    if json_path is not None:
+        write_results(json_path, config, records, fits=fits)
+    if csv_path is not None:
+        write_tidy(csv_path, records)
+    return records
+
+def run_memory_suite(plan=None, seed=0, engines=DEFAULT_ENGINES, rss=True,
+                     json_path=None, csv_path=None, verbose=True):
+    """
+    Memory counterpart of run_suite: runs memory_case on every case of 'plan', prints
+    the memory table and optionally writes the JSON results and the tidy CSV table.
+    Returns the records.
+    """
+    if plan is None:
+        plan = grid_plan({"n": DEFAULT_N_VALUES})
+    plan = [full_case(case) for case in plan]
+    config = {"mode": "memory", "plan": plan, "seed": seed, "engines": list(engines),
+              "rss": rss}
+    records = []
+    for case in plan:
+        try:
+            records.extend(memory_case(case, seed, engines, rss))
+        except ValueError as e:
+            if verbose:
+                print(f"Skipping case {case_key(case)}: {e}")
+    if verbose:
+        print_memory_table(records, engines)
+    if json_path is not None:
+        write_results(json_path, config, records)
+    if csv_path is not None:
+        write_tidy(csv_path, records, MEMORY_COLUMNS)
+    return records
+
+def run_phase_suite(plan=None, seed=0, engines=DEFAULT_ENGINES, warmup=2, repeats=7,
+                    batch_sizes=BATCH_SIZES, json_path=None, csv_path=None, verbose=True):
+    """
+    Phase counterpart of run_suite: runs phase_case on every case of 'plan', prints the
+    phase table and optionally writes the JSON results and the tidy CSV table.
+    Returns the records.
+    """
+    if plan is None:
+        plan = grid_plan({"n": DEFAULT_N_VALUES})
+    plan = [full_case(case) for case in plan]
+    config = {"mode": "phases", "plan": plan, "seed": seed, "engines": list(engines),
+              "warmup": warmup, "repeats": repeats, "batch_sizes": list(batch_sizes)}
+    records = []
+    for case in plan:
+        try:
+            records.extend(phase_case(case, seed, engines, warmup, repeats, batch_sizes))
+        except ValueError as e:
+            if verbose:
+                print(f"Skipping case {case_key(case)}: {e}")
+    if verbose:
+        print_phase_table(records, batch_sizes)
+    if json_path is not None:
+        write_results(json_path, config, records)
+    if csv_path is not None:
+        write_tidy(csv_path, records, CASE_KEYS + ("engine", "skipped", "error", "build_ns",
+                                                   "solve_ns", "strand_teardown_ns",
+                                                   "index_teardown_ns") +
+                   tuple(f"amortized_{b}_ns" for b in batch_sizes) + ("repeats", "seed"))
+    return records
+
+# Run configuration a baseline must hold to be rerun (see run_suite).
+BASELINE_KEYS = ("plan", "seed", "engines", "warmup", "repeats", "isolate_gc")
+
+def baseline_config(data, path):
+    """
+    Returns the run configuration of a result file read by read_results, checking
+    that it is a timing run (run_suite) that can be rerun as a baseline.
+    """
+    config = data.get("config", {})
+    # Timing runs written before the mode was recorded have no "mode".
+    mode = config.get("mode", "time")
+    if mode != "time":
+        raise ValueError(f"{path}: a {mode} run can't be a baseline; write one without "
+                         f"--memory or --phases")
+    missing = [key for key in BASELINE_KEYS if key not in config]
+    if missing:
+        raise ValueError(f"{path}: baseline run configuration lacks {', '.join(missing)}")
+    return config
+
+def run_regression(baseline_path, threshold=REGRESSION_THRESHOLD, json_path=None,
+                   csv_path=None, verbose=True):
+    """
+    Reruns the seeded workloads of a stored run ('baseline_path', see write_results)
+    with its engines and settings, and compares the medians (compare_results).
+    Optionally writes the new run as JSON (with the comparison) and the comparison
+    as a tidy CSV table. Returns the comparison.
+    """
+    baseline = read_results(baseline_path)
+    config = baseline_config(baseline, baseline_path)
+    if verbose:
+        ours, theirs = environment(), baseline["environment"]
+        for key in ("implementation", "python", "machine"):
+            if ours.get(key) != theirs.get(key):
+                print(f"WARNING: baseline {key} was {theirs.get(key)!r}, now {ours.get(key)!r}")
+    records = run_suite(config["plan"], config["seed"], config["engines"], config["warmup"],
+                        config["repeats"], config["isolate_gc"], verbose=verbose)
+    comparison = compare_results(baseline["records"], records, threshold)
+    if verbose:
+        print()
+        print_comparison(comparison, config["engines"], threshold)
+    if json_path is not None:
+        write_results(json_path, config, records, comparison=comparison)
+    if csv_path is not None:
+        write_tidy(csv_path, comparison, COMPARISON_COLUMNS)
+    return comparison
+
+def parse_axis(text, kind):
+    """
+    Parses the levels of one sweep axis from the command line: "1,2,5" lists levels;
+    "LOW:HIGH" is a numeric range (for --plan lhs).
+    """
+    if kind is not str and ":" in text:
+        low, high = text.split(":")
+        return (kind(low), kind(high))
+    return [kind(level) for level in text.split(",")]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the protein parsing engines. Every case parameter takes "
+                    "comma-separated levels (or LOW:HIGH for a Latin hypercube plan).")
+    parser.add_argument("--n", default=",".join(map(str, DEFAULT_N_VALUES)),
+                        help="strand lengths")
+    parser.add_argument("--k", default="50", help="maximum marker lengths")
+    parser.add_argument("--markers", default="1000", help="marker set sizes |P|")
+    parser.add_argument("--lengths", default="uniform",
+                        help=f"marker length distributions ({', '.join(LENGTH_DISTRIBUTIONS)})")
+    parser.add_argument("--alphabet", default="4",
+                        help=f"alphabet sizes (1..{len(ALPHABET)})")
+    parser.add_argument("--workload", default="random",
+                        help=f"input generators ({', '.join(WORKLOADS)})")
+    parser.add_argument("--density", default="0.5",
+                        help="realistic workload: fraction of the strand covered by markers")
+    parser.add_argument("--prefix-share", default="0",
+                        help="realistic workload: fraction of markers sharing a prefix")
+    parser.add_argument("--corpus", action="store_true",
+                        help="run the adversarial corpus (every adversarial workload)")
+    parser.add_argument("--plan", choices=("grid", "lhs"), default="grid",
+                        help="every combination of levels, or a Latin hypercube sample")
+    parser.add_argument("--samples", type=int, default=20, help="cases of a --plan lhs")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the inputs and the plan")
+    parser.add_argument("--engines", nargs="+", default=DEFAULT_ENGINES,
+                        help="engines to run (default: all but Parallel)")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls per cell")
+    parser.add_argument("--repeats", type=int, default=7, help="timed calls per cell")
+    parser.add_argument("--no-gc-isolation", action="store_true",
+                        help="leave the garbage collector running during trials")
+    parser.add_argument("--memory", action="store_true",
+                        help="measure memory (tracemalloc and peak RSS) instead of time")
+    parser.add_argument("--no-rss", action="store_true",
+                        help="with --memory: skip the per-cell processes measuring RSS")
+    parser.add_argument("--phases", action="store_true",
+                        help="time build, solve and teardown separately, with amortised "
+                             "per-strand costs")
+    parser.add_argument("--batch-sizes", default=",".join(map(str, BATCH_SIZES)),
+                        help="with --phases: strands per build to amortise over")
+    parser.add_argument("--fit", action="store_true",
+                        help="fit the exponents of N and k and flag any beyond the "
+                             "documented complexity")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="rerun the workloads of a --json result file and compare; "
+                             "exits with status 1 if any cell regressed (the case and "
+                             "engine options are taken from the file)")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD,
+                        help="with --baseline: largest tolerated relative slow-down")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--csv", metavar="PATH", help="write the tidy result table as CSV")
+    args = parser.parse_args(argv)
+    for name in args.engines:
+        try:
+            engine_method(name)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+    if args.threshold < 0:
+        parser.error("--threshold must not be negative")
+    if args.baseline:
+        try:
+            baseline_config(read_results(args.baseline), args.baseline)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    try:
+        args.axes = {
+            "n": parse_axis(args.n, int),
+            "k": parse_axis(args.k, int),
+            "num_markers": parse_axis(args.markers, int),
+            "length_dist": parse_axis(args.lengths, str),
+            "alphabet_size": parse_axis(args.alphabet, int),
+            "workload": list(ADVERSARIAL) if args.corpus else parse_axis(args.workload, str),
+            "density": parse_axis(args.density, float),
+            "prefix_share": parse_axis(args.prefix_share, float),
+        }
+    except ValueError as e:
+        parser.error(str(e))
+    if args.plan == "grid" and any(isinstance(axis, tuple) for axis in args.axes.values()):
+        parser.error("LOW:HIGH ranges need --plan lhs")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.plan == "grid":
+        plan = grid_plan(args.axes)
+    else:
+        plan = lhs_plan(args.axes, args.samples, args.seed)
+    if args.baseline:
+        if regressions(run_regression(args.baseline, args.threshold, args.json, args.csv)):
+            sys.exit(1)
+    elif args.phases:
+        run_phase_suite(plan, args.seed, args.engines, args.warmup, args.repeats,
+                        [int(b) for b in args.batch_sizes.split(",")], args.json, args.csv)
+    elif args.memory:
+        run_memory_suite(plan, args.seed, args.engines, not args.no_rss, args.json, args.csv)
+    else:
+        run_suite(plan, args.seed, args.engines, args.warmup, args.repeats,
+                  not args.no_gc_isolation, args.json, args.csv, fit=args.fit)
+
+if __name__ == "__main__":
+    main()
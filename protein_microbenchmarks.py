@@ -0,0 +1,301 @@
+import random
+import argparse
+import itertools
+
+from protein_parsing_approaches import Trie, FlatTrie
+from protein_benchmarks import measure, summarize, write_results, write_tidy, parse_axis
+
+# -----------------------------------------------------------------------------
+# Workloads
+# -----------------------------------------------------------------------------
+
+# The engines' inner loops come down to a handful of primitives. Each is timed alone
+# on 'queries' lookups of markers of one length L drawn from a marker set of one
+# size: the strand is the queried markers back to back, so every slice is a marker
+# and every walk goes the full L steps (the most work a lookup can do).
+
+# Marker lengths (string lengths) and marker set sizes of the default run.
+DEFAULT_LENGTHS = [1, 4, 16, 50]
+DEFAULT_SET_SIZES = [10, 1000, 10000]
+
+# Lookups per timed call.
+DEFAULT_QUERIES = 10000
+
+# Columns of the tidy result table.
+MICRO_COLUMNS = ("length", "set_size", "primitive", "baseline", "median_ns", "iqr_ns",
+                 "net_ns_per_op", "net_ns_per_char", "queries", "seed")
+
+def fixed_length_markers(length, set_size, rng):
+    """
+    Returns min(set_size, 4^length) distinct DNA markers of the given length.
+    """
+    capacity = 4 ** length
+    if capacity <= 4 * set_size:
+        # Nearly every marker is needed: enumerate them rather than draw duplicates.
+        every = ["".join(p) for p in itertools.product("ACGT", repeat=length)]
+        return rng.sample(every, min(set_size, capacity))
+    markers = set()
+    while len(markers) < set_size:
+        markers.add("".join(rng.choices("ACGT", k=length)))
+    return sorted(markers)
+
+def make_workload(length, set_size, queries, seed):
+    """
+    Builds the inputs every primitive runs on: the marker set, the strand of
+    'queries' markers back to back, the start of each, and both Tries of the set.
+    """
+    rng = random.Random(f"{seed}:{length}:{set_size}")
+    markers = fixed_length_markers(length, set_size, rng)
+    strand = "".join(rng.choices(markers, k=queries))
+    trie = Trie()
+    for p in markers:
+        trie.insert(p)
+    flat = FlatTrie(markers)
+    return {
+        "length": length,
+        "set_size": len(markers),
+        "strand": strand,
+        "starts": range(0, queries * length, length),
+        "markers": set(markers),
+        "root": trie.root,
+        "flat": flat,
+        "codes": memoryview(flat.encode(strand)),
+    }
+
+# -----------------------------------------------------------------------------
+# Primitives
+# -----------------------------------------------------------------------------
+
+# Every primitive is a factory: given a workload, it returns a function running one
+# lookup per start. Inputs are bound to locals first, as in the engines.
+
+def loop(w):
+    # The bare loop over the starts: the floor every other primitive pays.
+    starts = w["starts"]
+    def run():
+        for i in starts:
+            pass
+    return run
+
+def str_slice(w):
+    # Cutting a candidate out of the strand (Bottom-Up: self.strand[idx : idx + L]).
+    strand, starts, length = w["strand"], w["starts"], w["length"]
+    def run():
+        for i in starts:
+            strand[i : i + length]
+    return run
+
+def set_lookup(w):
+    # Slice plus membership test (Bottom-Up: substring in self.protein_markers). A new
+    # slice has no cached hash, so the test hashes all L characters first.
+    strand, starts, length, markers = w["strand"], w["starts"], w["length"], w["markers"]
+    def run():
+        for i in starts:
+            strand[i : i + length] in markers
+    return run
+
+def str_walk(w):
+    # Iterating over the characters of a slice, as the TrieNode walks do.
+    strand, starts, length = w["strand"], w["starts"], w["length"]
+    def run():
+        for i in starts:
+            for ch in strand[i : i + length]:
+                pass
+    return run
+
+def dict_double(w):
+    # TrieNode walk with a membership test and then an index per step
+    # (Trie.insert: ch not in node.children, then node.children[ch]).
+    strand, starts, length, root = w["strand"], w["starts"], w["length"], w["root"]
+    def run():
+        for i in starts:
+            node = root
+            for ch in strand[i : i + length]:
+                if ch not in node.children:
+                    break
+                node = node.children[ch]
+    return run
+
+def dict_get(w):
+    # TrieNode walk with a single dict.get per step.
+    strand, starts, length, root = w["strand"], w["starts"], w["length"], w["root"]
+    def run():
+        for i in starts:
+            node = root
+            for ch in strand[i : i + length]:
+                node = node.children.get(ch)
+                if node is None:
+                    break
+    return run
+
+def code_walk(w):
+    # Iterating over a memoryview slice of code bytes, as Trie-DP does.
+    codes, starts, length = w["codes"], w["starts"], w["length"]
+    def run():
+        for i in starts:
+            for c in codes[i : i + length]:
+                pass
+    return run
+
+def flat_index(w):
+    # FlatTrie walk: one array index per step (Trie-DP: children[row + c]).
+    codes, starts, length = w["codes"], w["starts"], w["length"]
+    children = w["flat"].children
+    def run():
+        for i in starts:
+            row = 0
+            for c in codes[i : i + length]:
+                row = children[row + c]
+                if not row:
+                    break
+    return run
+
+# Timed primitives: (name, factory, baseline). The baseline is the primitive whose
+# time is subtracted to isolate this one: the loop it runs in, or for the set lookup
+# the slice it needs. The lookup's own cost is the "net" time.
+PRIMITIVES = [
+    ("loop", loop, None),
+    ("slice", str_slice, "loop"),
+    ("set-lookup", set_lookup, "slice"),
+    ("str-walk", str_walk, "loop"),
+    ("dict-in+[]", dict_double, "str-walk"),
+    ("dict-get", dict_get, "str-walk"),
+    ("code-walk", code_walk, "loop"),
+    ("flat-index", flat_index, "code-walk"),
+]
+
+def primitive(name):
+    """
+    Returns (factory, baseline name) of a timed primitive.
+    """
+    for entry, factory, baseline in PRIMITIVES:
+        if entry == name:
+            return factory, baseline
+    raise ValueError(f"Unknown primitive: {name!r} (choose from "
+                     f"{', '.join(entry for entry, _, _ in PRIMITIVES)})")
+
+# -----------------------------------------------------------------------------
+# Runner
+# -----------------------------------------------------------------------------
+
+def bench_workload(length, set_size, queries, seed, names, warmup=2, repeats=7):
+    """
+    Times the named primitives (and the baselines they need) on one workload. Returns
+    one record per named primitive with its median per call and the net cost per
+    lookup and per character, the baseline's median subtracted.
+    """
+    w = make_workload(length, set_size, queries, seed)
+    needed = []
+    for name in names:
+        while name is not None and name not in needed:
+            needed.append(name)
+            name = primitive(name)[1]
+    summaries = {}
+    for name in needed:
+        samples, _ = measure(primitive(name)[0](w), warmup, repeats)
+        summaries[name] = dict(summarize(samples), samples=samples)
+
+    records = []
+    for name in names:
+        baseline = primitive(name)[1]
+        net = summaries[name]["median_ns"]
+        if baseline is not None:
+            net -= summaries[baseline]["median_ns"]
+        records.append(dict(
+            summaries[name], length=length, set_size=w["set_size"], primitive=name,
+            baseline=baseline, net_ns_per_op=net / queries,
+            net_ns_per_char=net / (queries * length), queries=queries, seed=seed))
+    return records
+
+def print_micro_table(records, names):
+    """
+    Prints the net cost per lookup in nanoseconds of every primitive for every
+    workload. Net costs near zero are within noise and can come out negative.
+    """
+    print("Net ns per lookup (baseline subtracted)")
+    width = max([10] + [len(name) for name in names])
+    header = " | ".join([f"{'L':<4}", f"{'|P|':<6}"] + [f"{name:<{width}}" for name in names])
+    print(header)
+    print("-" * len(header))
+    cells = {(r["length"], r["set_size"], r["primitive"]): r["net_ns_per_op"] for r in records}
+    workloads = []
+    for r in records:
+        if (r["length"], r["set_size"]) not in workloads:
+            workloads.append((r["length"], r["set_size"]))
+    for length, set_size in workloads:
+        row = [f"{length:<4}", f"{set_size:<6}"]
+        row += [f"{cells[length, set_size, name]:<{width}.1f}" for name in names]
+        print(" | ".join(row))
+
+def run_micro_suite(lengths=DEFAULT_LENGTHS, set_sizes=DEFAULT_SET_SIZES,
+                    queries=DEFAULT_QUERIES, seed=0, names=None, warmup=2, repeats=7,
+                    json_path=None, csv_path=None, verbose=True):
+    """
+    Times the primitives on every combination of marker length and marker set size,
+    prints the table and optionally writes the JSON results and the tidy CSV table.
+    Returns the records.
+    """
+    if names is None:
+        names = [name for name, _, _ in PRIMITIVES]
+    config = {"lengths": list(lengths), "set_sizes": list(set_sizes), "queries": queries,
+              "seed": seed, "primitives": list(names), "warmup": warmup, "repeats": repeats}
+    records = []
+    for length in lengths:
+        # Short markers cap the set size (see fixed_length_markers); run each set once.
+        for set_size in sorted({min(size, 4 ** length) for size in set_sizes}):
+            if verbose:
+                print(f"Timing L={length}, |P|={set_size}...")
+            records.extend(bench_workload(length, set_size, queries, seed, names,
+                                          warmup, repeats))
+    if verbose:
+        print_micro_table(records, names)
+    if json_path is not None:
+        write_results(json_path, config, records)
+    if csv_path is not None:
+        write_tidy(csv_path, records, MICRO_COLUMNS)
+    return records
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time the hot-loop primitives of the protein parsing engines alone, "
+                    "across marker lengths and marker set sizes.")
+    parser.add_argument("--lengths", default=",".join(map(str, DEFAULT_LENGTHS)),
+                        help="marker (string) lengths L")
+    parser.add_argument("--set-sizes", default=",".join(map(str, DEFAULT_SET_SIZES)),
+                        help="marker set sizes |P| (capped at 4^L)")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES,
+                        help="lookups per timed call")
+    parser.add_argument("--primitives", nargs="+",
+                        default=[name for name, _, _ in PRIMITIVES],
+                        help="primitives to time (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the markers")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed calls per cell")
+    parser.add_argument("--repeats", type=int, default=7, help="timed calls per cell")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--csv", metavar="PATH", help="write the tidy result table as CSV")
+    args = parser.parse_args(argv)
+    for name in args.primitives:
+        try:
+            primitive(name)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+    if args.queries < 1:
+        parser.error("--queries must be at least 1")
+    try:
+        args.lengths = parse_axis(args.lengths, int)
+        args.set_sizes = parse_axis(args.set_sizes, int)
+    except ValueError as e:
+        parser.error(str(e))
+    if isinstance(args.lengths, tuple) or isinstance(args.set_sizes, tuple):
+        parser.error("give lists of levels, not LOW:HIGH ranges")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_micro_suite(args.lengths, args.set_sizes, args.queries, args.seed, args.primitives,
+                    args.warmup, args.repeats, args.json, args.csv)
+
+if __name__ == "__main__":
+    main()